@@ -94,7 +94,7 @@ class ArrayAdapter(VisualizationAdapter):
             else:
                 # No visible change — still emit a step marker so the frontend
                 # has a 1:1 mapping for this step
-                if step.step_type == StepType.CONDITION:
+                if step.step_type is StepType.CONDITION:
                     # Comparison happening — try to emit COMPARE
                     comp_indices = self._guess_compare_indices(step, prev_arr)
                     if comp_indices:
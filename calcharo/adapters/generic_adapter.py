@@ -80,7 +80,7 @@ class GenericAdapter(VisualizationAdapter):
                     self.animation_sequence.append(delete_cmd)
 
             # Control flow markers
-            if step.step_type == StepType.CONDITION:
+            if step.step_type is StepType.CONDITION:
                 condition_cmd = AnimationCommand(
                     command_type=CommandType.HIGHLIGHT,
                     target_ids=[f'line_{step.line_number}'],
@@ -96,7 +96,7 @@ class GenericAdapter(VisualizationAdapter):
                 )
                 self.animation_sequence.append(condition_cmd)
 
-            elif step.step_type == StepType.LOOP_START:
+            elif step.step_type is StepType.LOOP_START:
                 loop_cmd = AnimationCommand(
                     command_type=CommandType.MARK,
                     target_ids=[f'loop_{step.line_number}'],
@@ -111,7 +111,7 @@ class GenericAdapter(VisualizationAdapter):
                 )
                 self.animation_sequence.append(loop_cmd)
 
-            elif step.step_type == StepType.LOOP_END:
+            elif step.step_type is StepType.LOOP_END:
                 loop_end_cmd = AnimationCommand(
                     command_type=CommandType.UNMARK,
                     target_ids=[f'loop_{step.line_number}'],
@@ -121,7 +121,7 @@ class GenericAdapter(VisualizationAdapter):
                 )
                 self.animation_sequence.append(loop_end_cmd)
 
-            elif step.step_type == StepType.FUNCTION_CALL:
+            elif step.step_type is StepType.FUNCTION_CALL:
                 call_cmd = AnimationCommand(
                     command_type=CommandType.MARK,
                     target_ids=[f'func_{step.source_code}'],
@@ -136,7 +136,7 @@ class GenericAdapter(VisualizationAdapter):
                 )
                 self.animation_sequence.append(call_cmd)
 
-            elif step.step_type == StepType.FUNCTION_RETURN:
+            elif step.step_type is StepType.FUNCTION_RETURN:
                 return_cmd = AnimationCommand(
                     command_type=CommandType.UNMARK,
                     target_ids=[f'func_return'],
@@ -150,7 +150,7 @@ class GenericAdapter(VisualizationAdapter):
                 )
                 self.animation_sequence.append(return_cmd)
 
-            elif step.step_type == StepType.PRINT:
+            elif step.step_type is StepType.PRINT:
                 print_cmd = AnimationCommand(
                     command_type=CommandType.LABEL,
                     target_ids=['console'],
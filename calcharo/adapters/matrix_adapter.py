@@ -108,7 +108,7 @@ class MatrixAdapter(VisualizationAdapter):
                         self.animation_sequence.append(row_cmd)
 
             # Check for DP table filling pattern
-            if step.step_type == StepType.LOOP_ITERATION:
+            if step.step_type is StepType.LOOP_ITERATION:
                 # Check if we're iterating over i, j — classic DP
                 i_val = step.variables_state.get('i')
                 j_val = step.variables_state.get('j')
@@ -150,7 +150,7 @@ class StringAdapter(VisualizationAdapter):
                     self.animation_sequence.append(highlight_cmd)
             
             # Check for string comparisons
-            if step.step_type == StepType.CONDITION:
+            if step.step_type is StepType.CONDITION:
                 # Might be comparing strings
                 compare_cmd = AnimationCommand(
                     command_type=CommandType.COMPARE,
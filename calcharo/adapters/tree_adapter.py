@@ -152,7 +152,7 @@ class TreeAdapter(VisualizationAdapter):
             previous_tree = current_tree
 
             # Check for traversal patterns in step type
-            if step.step_type == StepType.FUNCTION_CALL:
+            if step.step_type is StepType.FUNCTION_CALL:
                 # Could be recursive traversal
                 self._check_traversal_pattern(step)
 
@@ -260,26 +260,18 @@ class ExecutionTracer:
         for warning in warnings:
             logger.warning(f"Config warning: {warning}")
     
-    def trace(self, code: str) -> List[ExecutionStep]:
+    def trace(self, code: Union[str, ast.Module]) -> List[ExecutionStep]:
         # The main entry point - feed it code, get execution steps
+        # Already have an ast.Module (e.g. parsed once and traced many times)? Pass it straight in.
         logger.info(f"Starting trace with mode={self.config.tracing_mode.name}")
         
-        # Validate the input (garbage in, garbage out)
-        if not code or not code.strip():
-            raise ValidationError("Empty code provided")
-        
-        if len(code) > 1000000:  # 1MB of code? Really?
-            raise ValidationError("Code size exceeds maximum limit")
-        
-        # Try to parse it
-        try:
-            tree = ast.parse(code)
-        except SyntaxError as e:
-            raise ParseError(
-                f"Failed to parse code: {e}",
-                line_number=e.lineno,
-                source_code=code.split('\n')[e.lineno - 1] if e.lineno else None
-            )
+        if isinstance(code, ast.Module):
+            # Pre-parsed: the source checks already happened upstream, just make sure there's a body
+            if not code.body:
+                raise ValidationError("Empty code provided")
+            tree = code
+        else:
+            tree = self._parse(code)
         
         # Set up the execution context
         context = ExecutionContext(
@@ -304,6 +296,25 @@ class ExecutionTracer:
         logger.info(f"Trace completed with {len(self.steps)} steps")
         return self.steps
     
+    @staticmethod
+    def _parse(code: str) -> ast.Module:
+        # Validate the input (garbage in, garbage out)
+        if not code or not code.strip():
+            raise ValidationError("Empty code provided")
+        
+        if len(code) > 1000000:  # 1MB of code? Really?
+            raise ValidationError("Code size exceeds maximum limit")
+        
+        # Try to parse it
+        try:
+            return ast.parse(code)
+        except SyntaxError as e:
+            raise ParseError(
+                f"Failed to parse code: {e}",
+                line_number=e.lineno,
+                source_code=code.split('\n')[e.lineno - 1] if e.lineno else None
+            )
+    
     @contextmanager
     def _execution_environment(self, context: ExecutionContext):
         # Set up the padded cell for code execution
@@ -733,8 +744,8 @@ class ExecutionTracer:
         return safe_builtins
 
 
-def execute_and_trace(code: str, config: Optional[TracerConfig] = None) -> List[ExecutionStep]:
+def execute_and_trace(code: Union[str, ast.Module], config: Optional[TracerConfig] = None) -> List[ExecutionStep]:
     # The simple API for simple people
-    # Just give it code, get back steps. Easy.
+    # Just give it code (source or a pre-parsed ast.Module), get back steps. Easy.
     tracer = ExecutionTracer(config)
     return tracer.trace(code)
\ No newline at end of file
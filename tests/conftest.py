@@ -0,0 +1,36 @@
+# Shared pytest fixtures for the test suite
+
+import pytest
+
+try:
+    import pytest_codspeed  # noqa: F401 - the plugin registers its own benchmark fixture
+except ImportError:
+    pytest_codspeed = None
+
+from calcharo.adapters import AdapterRegistry, ArrayAdapter, GraphAdapter, StringAdapter
+
+
+@pytest.fixture
+def adapters():
+    # Adapters latch onto a variable name in can_handle (tracked_*_name) and
+    # base reset() keeps it, so a shared instance would carry one test's
+    # choice into the next. Construction is cheap; build a fresh set per test.
+    return {
+        "array": ArrayAdapter(),
+        "graph": GraphAdapter(),
+        "string": StringAdapter(),
+    }
+
+
+@pytest.fixture(scope="session")
+def adapter_info():
+    # Built from ADAPTER_PRIORITY, which never changes mid-run
+    return AdapterRegistry.get_adapter_info()
+
+
+if pytest_codspeed is None:
+    # Without pytest-codspeed, benchmark(fn, *args) just calls fn once so the
+    # tests using it still check their results
+    @pytest.fixture
+    def benchmark():
+        return lambda fn, *args, **kwargs: fn(*args, **kwargs)
@@ -1,12 +1,13 @@
 # Tests that actually test things (shocking, I know)
 # If these pass, we can pretend the code works
 
+import ast
 import sys
-import os
 import json
 import time
-from typing import List, Dict, Any
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from collections import defaultdict
+from operator import attrgetter
+from typing import List, Any
 
 from calcharo import (
     execute_and_trace,
@@ -19,100 +20,236 @@ from calcharo import (
     ExecutionError
 )
 from calcharo.core.models import StepType
+from calcharo.core.config import OptimizationLevel
+
+
+# Snippets under test, parsed once at import - execute_and_trace takes the ast.Module directly
+
+BUBBLE_SORT_CODE = '''
+def bubble_sort(arr):
+    """Sort array using bubble sort - O(n²) baby!"""
+    n = len(arr)
+    for i in range(n):
+        swapped = False
+        for j in range(n - i - 1):
+            if arr[j] > arr[j + 1]:
+                arr[j], arr[j + 1] = arr[j + 1], arr[j]
+                swapped = True
+        if not swapped:
+            break  # Early exit for the optimists
+    return arr
+
+# Let's sort some numbers
+test_array = [64, 34, 25, 12, 22, 11, 90]
+print(f"Original: {test_array}")
+sorted_array = bubble_sort(test_array)
+print(f"Sorted: {sorted_array}")
+'''
+BUBBLE_SORT_AST = ast.parse(BUBBLE_SORT_CODE)
+
+
+RECURSIVE_CODE = '''
+def factorial(n):
+    """n! - The classic recursion example"""
+    if n <= 1:
+        return 1
+    return n * factorial(n - 1)
+
+def fibonacci(n):
+    """Fibonacci - Making CPUs cry since forever"""
+    if n <= 1:
+        return n
+    return fibonacci(n - 1) + fibonacci(n - 2)
+
+# Test the recursion
+fact_5 = factorial(5)
+print(f"5! = {fact_5}")
+
+fib_6 = fibonacci(6)
+print(f"Fibonacci(6) = {fib_6}")
+'''
+RECURSIVE_AST = ast.parse(RECURSIVE_CODE)
+
+
+COMPLEX_CODE = '''
+def analyze_numbers(numbers):
+    """Overengineered number analysis"""
+    stats = {
+        'sum': 0,
+        'count': 0,
+        'evens': [],
+        'odds': []
+    }
+    
+    for num in numbers:
+        stats['sum'] += num
+        stats['count'] += 1
+        
+        if num % 2 == 0:
+            stats['evens'].append(num)
+        else:
+            stats['odds'].append(num)
+    
+    # Calculate average (with safety check because division by zero is bad)
+    stats['average'] = stats['sum'] / stats['count'] if stats['count'] > 0 else 0
+    
+    # Find min and max the hard way
+    if numbers:
+        min_val = max_val = numbers[0]
+        for num in numbers:
+            if num < min_val:
+                min_val = num
+            elif num > max_val:
+                max_val = num
+        stats['min'] = min_val
+        stats['max'] = max_val
+    
+    return stats
+
+# Test with real data
+test_data = [3, 7, 2, 9, 1, 4, 6, 8, 5]
+result = analyze_numbers(test_data)
+print(f"Analysis: {result}")
+
+# Edge case because we're thorough
+empty_result = analyze_numbers([])
+print(f"Empty analysis: {empty_result}")
+'''
+COMPLEX_AST = ast.parse(COMPLEX_CODE)
+
+
+PERFORMANCE_CODE = '''
+# Generate some data
+data = list(range(100))
+squared = [x ** 2 for x in data]
+filtered = [x for x in squared if x % 2 == 0]
+result = sum(filtered)
+print(f"Result: {result}")
+'''
+PERFORMANCE_AST = ast.parse(PERFORMANCE_CODE)
+
+
+SIMPLE_CODE = '''
+x = 42
+y = "hello"
+z = [1, 2, 3]
+result = {"value": x, "message": y, "data": z}
+'''
+SIMPLE_AST = ast.parse(SIMPLE_CODE)
+
+
+_STATUS_LABELS = ("FAIL", "PASS")  # Indexed by the pass mask (False -> 0, True -> 1)
 
 
 class TestHarness:
     # Test harness because assert statements are too simple
+    __test__ = False  # Not a pytest test class, despite the name
     
     def __init__(self, name: str):
         self.name = name
-        self.results: List[Dict[str, Any]] = []
+        # Parallel lists instead of a dict per assertion
+        self._pass_mask: List[bool] = []
+        self._messages: List[str] = []
         self.passed = 0
         self.failed = 0
     
     def assert_true(self, condition: bool, message: str) -> bool:
         # The classic assertion - is it true or not?
-        if condition:
-            self.results.append({"status": "PASS", "message": message})
-            self.passed += 1
-            return True
-        else:
-            self.results.append({"status": "FAIL", "message": message})
-            self.failed += 1
-            return False
+        ok = bool(condition)
+        self._pass_mask.append(ok)
+        self._messages.append(message)
+        self.passed += ok
+        self.failed += not ok
+        return ok
     
     def assert_equals(self, actual: Any, expected: Any, message: str) -> bool:
-        # Are they equal? Let's find out!
-        return self.assert_true(actual == expected, f"{message} (expected: {expected}, got: {actual})")
+        # Are they equal? Let's find out! (only pay for the reprs when they aren't)
+        if actual == expected:
+            return self.assert_true(True, message)
+        return self.assert_true(False, f"{message} (expected: {expected!r}, got: {actual!r})")
     
     def assert_in(self, item: Any, container: Any, message: str) -> bool:
         # Is it in there somewhere?
-        return self.assert_true(item in container, f"{message} ({item} not in {container})")
+        if item in container:
+            return self.assert_true(True, message)
+        return self.assert_true(False, f"{message} ({item!r} not in {container!r})")
+    
+    def assert_line_startswith(self, prefix: str, lines: List[str], message: str) -> bool:
+        # Does any captured output line start with this? Split stdout once, check many prefixes
+        if any(line.startswith(prefix) for line in lines):
+            return self.assert_true(True, message)
+        return self.assert_true(False, f"{message} (no line starts with {prefix!r})")
     
     def assert_greater(self, actual: int, minimum: int, message: str) -> bool:
         # Bigger is better (sometimes)
-        return self.assert_true(actual > minimum, f"{message} ({actual} <= {minimum})")
+        if actual > minimum:
+            return self.assert_true(True, message)
+        return self.assert_true(False, f"{message} ({actual} <= {minimum})")
     
     def report(self) -> bool:
         # Print a nice report that makes us look professional
-        print(f"\n{'=' * 70}")
-        print(f"TEST SUITE: {self.name}")
-        print(f"{'=' * 70}")
-        
-        for result in self.results:
-            status_icon = "PASS" if result["status"] == "PASS" else "FAIL"
-            print(f"  {result['status']} {result['message']}")
-        
-        print(f"\nRESULTS: {self.passed} passed, {self.failed} failed")
-        print(f"STATUS: {'SUCCESS' if self.failed == 0 else 'FAILURE'}")
-        print("=" * 70)
+        # Build it in memory and write once - one write instead of one per assertion
+        rule = "=" * 70
+        lines = ["", rule, f"TEST SUITE: {self.name}", rule]
+        lines += [f"  {_STATUS_LABELS[ok]} {message}" for ok, message in zip(self._pass_mask, self._messages)]
+        lines += [
+            "",
+            f"RESULTS: {self.passed} passed, {self.failed} failed",
+            f"STATUS: {'SUCCESS' if self.failed == 0 else 'FAILURE'}",
+            rule,
+        ]
+        text = "\n".join(lines) + "\n"
+        
+        # Encode the whole block once and hand the bytes straight to the binary layer
+        out = sys.stdout
+        binary = getattr(out, "buffer", None)
+        if binary is None:
+            out.write(text)  # Text-only stream (some capture setups)
+        else:
+            out.flush()  # Anything already written as text goes first
+            binary.write(text.encode(out.encoding or "utf-8", errors="replace"))
+            binary.flush()
         return self.failed == 0
 
 
-def test_bubble_sort_comprehensive():
+def _timed_trace(code, config):
+    # Trace once and report how long it took (seconds)
+    start = time.perf_counter()
+    steps = execute_and_trace(code, config)
+    return steps, time.perf_counter() - start
+
+
+def _bubble_sort_comprehensive() -> bool:
     # Test bubble sort because it's the hello world of sorting
     harness = TestHarness("Bubble Sort Comprehensive")
     
-    bubble_sort_code = '''
-def bubble_sort(arr):
-    """Sort array using bubble sort - O(n²) baby!"""
-    n = len(arr)
-    for i in range(n):
-        swapped = False
-        for j in range(n - i - 1):
-            if arr[j] > arr[j + 1]:
-                arr[j], arr[j + 1] = arr[j + 1], arr[j]
-                swapped = True
-        if not swapped:
-            break  # Early exit for the optimists
-    return arr
-
-# Let's sort some numbers
-test_array = [64, 34, 25, 12, 22, 11, 90]
-print(f"Original: {test_array}")
-sorted_array = bubble_sort(test_array)
-print(f"Sorted: {sorted_array}")
-'''
-    
     try:
         # Run it with production config (because we're serious)
         config = ConfigPresets.production()
-        steps = execute_and_trace(bubble_sort_code, config)
+        steps = execute_and_trace(BUBBLE_SORT_AST, config)
+        
+        # Bin steps by type once instead of re-scanning per filter
+        by_type = defaultdict(list)
+        for s in steps:
+            by_type[s.step_type].append(s)
         
         # Did we capture enough steps?
         harness.assert_greater(len(steps), 50, "Sufficient steps captured")
         
         # Check function calls happened
-        function_defs = [s for s in steps if s.step_type == StepType.FUNCTION_CALL]
+        function_defs = by_type[StepType.FUNCTION_CALL]
         harness.assert_greater(len(function_defs), 0, "Function calls tracked")
         
         # Track how the array changes over time
+        # Each step owns a deep copy of its variables, so keep the list as-is rather than slicing it
         array_states = []
+        previous = None
         for step in steps:
-            if 'test_array' in step.variables_state:
-                current = step.variables_state['test_array']
-                if not array_states or array_states[-1] != current:
-                    array_states.append(current[:])
+            current = step.variables_state.get('test_array')
+            if current is None or current == previous:
+                continue
+            array_states.append(current)
+            previous = current
         
         harness.assert_greater(len(array_states), 1, "Multiple array states captured")
         
@@ -134,11 +271,12 @@ print(f"Sorted: {sorted_array}")
             )
         
         # Check print capture worked
-        harness.assert_in("Original:", final_step.stdout_snapshot, "Original print captured")
-        harness.assert_in("Sorted:", final_step.stdout_snapshot, "Sorted print captured")
+        stdout_lines = final_step.stdout_snapshot.splitlines()
+        harness.assert_line_startswith("Original:", stdout_lines, "Original print captured")
+        harness.assert_line_startswith("Sorted:", stdout_lines, "Sorted print captured")
         
         # Heap tracking for the paranoid
-        heap_tracked = any(step.heap_state for step in steps)
+        heap_tracked = any(map(attrgetter('heap_state'), steps))
         harness.assert_true(heap_tracked, "Heap state tracked for mutable objects")
         
         # Performance check (it shouldn't take forever)
@@ -151,63 +289,46 @@ print(f"Sorted: {sorted_array}")
     return harness.report()
 
 
-def test_recursive_functions():
+def _recursive_functions() -> bool:
     # Recursion - because loops are too mainstream
     harness = TestHarness("Recursive Functions")
     
-    recursive_code = '''
-def factorial(n):
-    """n! - The classic recursion example"""
-    if n <= 1:
-        return 1
-    return n * factorial(n - 1)
-
-def fibonacci(n):
-    """Fibonacci - Making CPUs cry since forever"""
-    if n <= 1:
-        return n
-    return fibonacci(n - 1) + fibonacci(n - 2)
-
-# Test the recursion
-fact_5 = factorial(5)
-print(f"5! = {fact_5}")
-
-fib_6 = fibonacci(6)
-print(f"Fibonacci(6) = {fib_6}")
-'''
-    
     try:
         config = TracerConfig(max_recursion_depth=100)  # Don't blow the stack
-        steps = execute_and_trace(recursive_code, config)
+        steps = execute_and_trace(RECURSIVE_AST, config)
         
-        # Check factorial worked
-        fact_found = any(
-            step.variables_state.get('fact_5') == 120 
-            for step in steps
-        )
+        # One pass over the trace: bin by type, look for the results, track stack depth
+        by_type = defaultdict(list)
+        fact_found = fib_found = False
+        max_stack_depth = 0
+        for step in steps:
+            by_type[step.step_type].append(step)
+            v = step.variables_state
+            if not fact_found and v.get('fact_5') == 120:
+                fact_found = True
+            if not fib_found and v.get('fib_6') == 8:
+                fib_found = True
+            d = len(step.call_stack)
+            if d > max_stack_depth:
+                max_stack_depth = d
+        
+        # Check factorial and Fibonacci worked
         harness.assert_true(fact_found, "Factorial(5) = 120 computed")
-        
-        # Check Fibonacci worked
-        fib_found = any(
-            step.variables_state.get('fib_6') == 8
-            for step in steps
-        )
         harness.assert_true(fib_found, "Fibonacci(6) = 8 computed")
         
         # Check we tracked the call stack properly
-        max_stack_depth = max(len(step.call_stack) for step in steps)
         harness.assert_greater(max_stack_depth, 2, f"Recursion depth tracked (max: {max_stack_depth})")
         
         # Count function calls and returns
-        calls = [s for s in steps if s.step_type == StepType.FUNCTION_CALL]
-        returns = [s for s in steps if s.step_type == StepType.FUNCTION_RETURN]
+        calls = by_type[StepType.FUNCTION_CALL]
+        returns = by_type[StepType.FUNCTION_RETURN]
         harness.assert_greater(len(calls), 5, f"Multiple function calls tracked ({len(calls)})")
         harness.assert_greater(len(returns), 5, f"Multiple function returns tracked ({len(returns)})")
         
         # Check output
-        final_stdout = steps[-1].stdout_snapshot
-        harness.assert_in("5! = 120", final_stdout, "Factorial output captured")
-        harness.assert_in("Fibonacci(6) = 8", final_stdout, "Fibonacci output captured")
+        stdout_lines = steps[-1].stdout_snapshot.splitlines()
+        harness.assert_line_startswith("5! = 120", stdout_lines, "Factorial output captured")
+        harness.assert_line_startswith("Fibonacci(6) = 8", stdout_lines, "Fibonacci output captured")
         
     except Exception as e:
         harness.assert_true(False, f"Unexpected error: {e}")
@@ -215,58 +336,18 @@ print(f"Fibonacci(6) = {fib_6}")
     return harness.report()
 
 
-def test_complex_control_flow():
+def _complex_control_flow() -> bool:
     # Nested loops and conditions - the fun stuff
     harness = TestHarness("Complex Control Flow")
     
-    complex_code = '''
-def analyze_numbers(numbers):
-    """Overengineered number analysis"""
-    stats = {
-        'sum': 0,
-        'count': 0,
-        'evens': [],
-        'odds': []
-    }
-    
-    for num in numbers:
-        stats['sum'] += num
-        stats['count'] += 1
-        
-        if num % 2 == 0:
-            stats['evens'].append(num)
-        else:
-            stats['odds'].append(num)
-    
-    # Calculate average (with safety check because division by zero is bad)
-    stats['average'] = stats['sum'] / stats['count'] if stats['count'] > 0 else 0
-    
-    # Find min and max the hard way
-    if numbers:
-        min_val = max_val = numbers[0]
-        for num in numbers:
-            if num < min_val:
-                min_val = num
-            elif num > max_val:
-                max_val = num
-        stats['min'] = min_val
-        stats['max'] = max_val
-    
-    return stats
-
-# Test with real data
-test_data = [3, 7, 2, 9, 1, 4, 6, 8, 5]
-result = analyze_numbers(test_data)
-print(f"Analysis: {result}")
-
-# Edge case because we're thorough
-empty_result = analyze_numbers([])
-print(f"Empty analysis: {empty_result}")
-'''
-    
     try:
         config = TracerConfig()
-        steps = execute_and_trace(complex_code, config)
+        steps = execute_and_trace(COMPLEX_AST, config)
+        
+        # Bin steps by type once instead of re-scanning per filter
+        by_type = defaultdict(list)
+        for s in steps:
+            by_type[s.step_type].append(s)
         
         # Check the math is right
         final_vars = steps[-1].variables_state
@@ -288,12 +369,12 @@ print(f"Empty analysis: {empty_result}")
             harness.assert_equals(empty_result['average'], 0, "Empty list average is 0")
         
         # Check control flow was executed
-        conditions = [s for s in steps if s.step_type == StepType.CONDITION]
+        conditions = by_type[StepType.CONDITION]
         harness.assert_greater(len(conditions), 10, f"Multiple conditions evaluated ({len(conditions)})")
         
         # Check loops ran
-        loop_starts = [s for s in steps if s.step_type == StepType.LOOP_START]
-        loop_iters = [s for s in steps if s.step_type == StepType.LOOP_ITERATION]
+        loop_starts = by_type[StepType.LOOP_START]
+        loop_iters = by_type[StepType.LOOP_ITERATION]
         harness.assert_greater(len(loop_starts), 2, "Multiple loops executed")
         harness.assert_greater(len(loop_iters), 15, "Multiple loop iterations")
         
@@ -303,7 +384,7 @@ print(f"Empty analysis: {empty_result}")
     return harness.report()
 
 
-def test_error_handling():
+def _error_handling() -> bool:
     # Test that errors are handled gracefully (or at least consistently)
     harness = TestHarness("Error Handling")
     
@@ -352,31 +433,18 @@ while x < 1000000:
     return harness.report()
 
 
-def test_performance_optimization():
+def _performance_optimization() -> bool:
     # Test that optimization actually does something
     harness = TestHarness("Performance Optimization")
     
-    performance_code = '''
-# Generate some data
-data = list(range(100))
-squared = [x ** 2 for x in data]
-filtered = [x for x in squared if x % 2 == 0]
-result = sum(filtered)
-print(f"Result: {result}")
-'''
-    
     try:
         # Test without optimization
         config_none = TracerConfig(optimization_level=OptimizationLevel.NONE)
-        start = time.time()
-        steps_none = execute_and_trace(performance_code, config_none)
-        time_none = time.time() - start
+        steps_none, time_none = _timed_trace(PERFORMANCE_AST, config_none)
         
         # Test with MAXIMUM OPTIMIZATION
         config_aggressive = ConfigPresets.performance()
-        start = time.time()
-        steps_aggressive = execute_and_trace(performance_code, config_aggressive)
-        time_aggressive = time.time() - start
+        steps_aggressive, time_aggressive = _timed_trace(PERFORMANCE_AST, config_aggressive)
         
         # Both should get the right answer
         for steps in [steps_none, steps_aggressive]:
@@ -384,10 +452,10 @@ print(f"Result: {result}")
             if 'result' in final_vars:
                 harness.assert_equals(final_vars['result'], 161700, "Calculation correct")
         
-        # We can't guarantee aggressive is faster in such a small test
-        # but at least document the times
+        # We can't guarantee aggressive is faster in such a small test,
+        # but neither should take long - and document the times
         harness.assert_true(
-            True,  # Always pass
+            time_none < 5.0 and time_aggressive < 5.0,
             f"Optimization comparison (none: {time_none:.3f}s, aggressive: {time_aggressive:.3f}s)"
         )
         
@@ -397,30 +465,28 @@ print(f"Result: {result}")
     return harness.report()
 
 
-def test_data_serialization():
+def _data_serialization() -> bool:
     # Test that we can serialize everything to JSON (web devs love JSON)
     harness = TestHarness("Data Serialization")
     
-    simple_code = '''
-x = 42
-y = "hello"
-z = [1, 2, 3]
-result = {"value": x, "message": y, "data": z}
-'''
-    
     try:
-        steps = execute_and_trace(simple_code)
-        
-        # Try to serialize every step
-        for step in steps:
-            try:
-                json_data = step.to_json()
-                json_str = json.dumps(json_data)
-                parsed = json.loads(json_str)  # Round trip
-                harness.assert_true(True, f"Step {step.step_number} serializable")
-            except Exception as e:
-                harness.assert_true(False, f"Step {step.step_number} serialization failed: {e}")
-                break
+        steps = execute_and_trace(SIMPLE_AST)
+        
+        # Try to serialize every step with the same encoder to_json and the API use -
+        # encoding without error is the check, no need to parse it back.
+        # One encoder call for the whole trace; only walk step by step to name the culprit.
+        try:
+            json.dumps([step.to_json() for step in steps])
+            harness.assert_true(True, f"All {len(steps)} steps serializable")
+        except Exception as batch_error:
+            for step in steps:
+                try:
+                    json.dumps(step.to_json())
+                except Exception as e:
+                    harness.assert_true(False, f"Step {step.step_number} serialization failed: {e}")
+                    break
+            else:
+                harness.assert_true(False, f"Trace serialization failed: {batch_error}")
         
         # Check the JSON has the fields we expect
         if steps:
@@ -437,51 +503,27 @@ result = {"value": x, "message": y, "data": z}
     return harness.report()
 
 
-def run_enterprise_test_suite():
-    # The main test suite - run all the tests and pray they pass
-    print("\n" + "=" * 70)
-    print("CALCHARO CORE - ENTERPRISE TEST SUITE")
-    print("=" * 70)
-    
-    # Import stuff we need for tests
-    global OptimizationLevel
-    from calcharo.core.config import OptimizationLevel
-    
-    test_results = []
-    
-    # Run ALL the tests
-    test_results.append(("Bubble Sort Comprehensive", test_bubble_sort_comprehensive()))
-    test_results.append(("Recursive Functions", test_recursive_functions()))
-    test_results.append(("Complex Control Flow", test_complex_control_flow()))
-    test_results.append(("Error Handling", test_error_handling()))
-    test_results.append(("Performance Optimization", test_performance_optimization()))
-    test_results.append(("Data Serialization", test_data_serialization()))
-    
-    # Final report card
-    print("\n" + "=" * 70)
-    print("ENTERPRISE TEST SUITE SUMMARY")
-    print("=" * 70)
-    
-    all_passed = True
-    for name, passed in test_results:
-        status = "PASS" if passed else "FAIL"
-        print(f"  {status} - {name}")
-        all_passed = all_passed and passed
-    
-    print("\n" + "=" * 70)
-    if all_passed:
-        print("ALL ENTERPRISE TESTS PASSED!")
-        print("Stage 1 Complete: Calcharo Core is production-ready")
-        print("Enterprise-grade architecture implemented")
-        print("Comprehensive error handling in place")
-        print("Performance optimizations functional")
-        print("Data serialization working")
-    else:
-        print("Some tests failed. Fix them or ship it anyway, your choice.")
-    print("=" * 70)
-    
-    return all_passed
+# ── pytest entry points (each suite prints its harness report; run with -n auto to spread them out) ──
+
+def test_bubble_sort_comprehensive():
+    assert _bubble_sort_comprehensive()
+
+
+def test_recursive_functions():
+    assert _recursive_functions()
+
+
+def test_complex_control_flow():
+    assert _complex_control_flow()
 
 
-if __name__ == "__main__":
-    run_enterprise_test_suite()
\ No newline at end of file
+def test_error_handling():
+    assert _error_handling()
+
+
+def test_performance_optimization():
+    assert _performance_optimization()
+
+
+def test_data_serialization():
+    assert _data_serialization()
@@ -1,174 +1,127 @@
 # tests/test_new_adapters.py — pytest tests for all 9 new adapters + registry
-import sys, os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 import pytest
+from dataclasses import replace
 from datetime import datetime
 from calcharo.core.models import ExecutionStep, StepType
 from calcharo.adapters import (
     StackAdapter, QueueAdapter, LinkedListAdapter, TreeAdapter,
     HeapAdapter, MatrixAdapter, HashMapAdapter, SetAdapter,
-    GenericAdapter, AdapterRegistry, auto_detect_adapter,
+    GenericAdapter, auto_detect_adapter,
 )
 
 
 # ── helpers ──────────────────────────────────────────────────────────
 
-def _step(line: int, variables: dict, step_number: int = 1, step_type: str = "ASSIGNMENT") -> ExecutionStep:
+# Adapters never look at timestamps, so every test step shares one fixed instant
+_NOW = datetime(2024, 1, 1)
+
+# Fields every test step shares; _step only swaps in what varies
+_TEMPLATE = ExecutionStep(
+    step_number=0,
+    timestamp=_NOW,
+    line_number=0,
+    column_number=0,
+    step_type=StepType.ASSIGNMENT,
+    source_code="# test",
+    variables_state={},
+    stdout_snapshot="",
+    stderr_snapshot="",
+    call_stack=(),
+    heap_state={},
+)
+
+
+def _step(line: int, variables: dict, step_number: int = 1, step_type: StepType = StepType.ASSIGNMENT) -> ExecutionStep:
     """Build a minimal ExecutionStep for testing."""
-    return ExecutionStep(
+    return replace(
+        _TEMPLATE,
         step_number=step_number,
-        timestamp=datetime.now(),
         line_number=line,
-        column_number=0,
-        step_type=StepType[step_type],
-        source_code="# test",
+        step_type=step_type,
         variables_state=variables,
-        stdout_snapshot="",
-        stderr_snapshot="",
-        call_stack=(),
-        heap_state={},
     )
 
 
-# ── StackAdapter ─────────────────────────────────────────────────────
-
-class TestStackAdapter:
-    def test_can_handle_stack(self):
-        steps = [_step(1, {"stack": []}), _step(2, {"stack": [1, 2]})]
-        adapter = StackAdapter()
-        assert adapter.can_handle(steps)
-
-    def test_generate_animations(self):
-        steps = [_step(1, {"stack": []}), _step(2, {"stack": [10]}), _step(3, {"stack": [10, 20]})]
-        adapter = StackAdapter()
-        adapter.can_handle(steps)  # sets tracked_stack_name
-        cmds = adapter.generate_animations(steps)
-        assert len(cmds) > 0
-
-
-# ── QueueAdapter ─────────────────────────────────────────────────────
-
-class TestQueueAdapter:
-    def test_can_handle_queue(self):
-        steps = [_step(1, {"queue": []}), _step(2, {"queue": [1]})]
-        adapter = QueueAdapter()
-        assert adapter.can_handle(steps)
+# ── shared step sequences (built once per module) ──────────────────
 
-    def test_can_handle_deque(self):
-        steps = [_step(1, {"deque": [1, 2, 3]})]
-        adapter = QueueAdapter()
-        assert adapter.can_handle(steps)
+@pytest.fixture(scope="module")
+def stack_steps():
+    return [_step(1, {"stack": []}), _step(2, {"stack": [10]}), _step(3, {"stack": [10, 20]})]
 
 
-# ── LinkedListAdapter ─────────────────────────────────────────────────
-
-class TestLinkedListAdapter:
-    def test_can_handle_linked_list_keywords(self):
-        steps = [_step(1, {"linked_list": [1, 2, 3]})]
-        adapter = LinkedListAdapter()
-        assert adapter.can_handle(steps)
-
-    def test_generate_animations(self):
-        steps = [_step(1, {"head": None}), _step(2, {"head": {"val": 1, "next": None}})]
-        adapter = LinkedListAdapter()
-        cmds = adapter.generate_animations(steps)
-        assert isinstance(cmds, list)
-
+@pytest.fixture(scope="module")
+def heap_steps():
+    return [
+        _step(1, {"heap": []}),
+        _step(2, {"heap": [5]}),
+        _step(3, {"heap": [5, 8]}),
+        _step(4, {"heap": [5, 8, 3]}),
+    ]
 
-# ── TreeAdapter ──────────────────────────────────────────────────────
 
-class TestTreeAdapter:
-    def test_can_handle_tree(self):
-        steps = [_step(1, {"root": {"val": 5, "left": None, "right": None}})]
-        adapter = TreeAdapter()
-        assert adapter.can_handle(steps)
+@pytest.fixture(scope="module")
+def hashmap_steps():
+    return [
+        _step(1, {"counts": {}}),
+        _step(2, {"counts": {"x": 1}}),
+        _step(3, {"counts": {"x": 2}}),
+    ]
 
-    def test_can_handle_heap_like_array(self):
-        steps = [_step(1, {"heap": [10, 20, 30]})]
-        adapter = TreeAdapter()
-        # TreeAdapter's keywords include 'heap', so it CAN handle it.
-        # In the registry, HeapAdapter has higher priority so it matches first.
-        assert adapter.can_handle(steps)
 
+@pytest.fixture(scope="module")
+def generic_steps():
+    return [_step(1, {"a": 1}), _step(2, {"a": 2, "b": 3})]
 
-# ── HeapAdapter ──────────────────────────────────────────────────────
 
-class TestHeapAdapter:
-    def test_can_handle_heap_name(self):
-        steps = [_step(1, {"heap": [3, 1, 2]})]
-        adapter = HeapAdapter()
-        assert adapter.can_handle(steps)
+# ── can_handle + generate_animations ────────────────────────────────
 
-    def test_generate_animations(self):
-        steps = [
-            _step(1, {"heap": []}),
-            _step(2, {"heap": [5]}),
-            _step(3, {"heap": [5, 8]}),
-            _step(4, {"heap": [5, 8, 3]}),
-        ]
-        adapter = HeapAdapter()
-        adapter.can_handle(steps)  # sets tracked_heap_name
-        cmds = adapter.generate_animations(steps)
-        assert len(cmds) > 0
-
-
-# ── MatrixAdapter ────────────────────────────────────────────────────
-
-class TestMatrixAdapter:
-    def test_can_handle_2d_list(self):
-        steps = [_step(1, {"grid": [[0, 0], [0, 0]]})]
-        adapter = MatrixAdapter()
-        assert adapter.can_handle(steps)
-
-    def test_can_handle_dp(self):
-        steps = [_step(1, {"dp": [[0, 1], [2, 3]]})]
-        adapter = MatrixAdapter()
-        assert adapter.can_handle(steps)
-
-
-# ── HashMapAdapter ───────────────────────────────────────────────────
-
-class TestHashMapAdapter:
-    def test_can_handle_dict(self):
-        steps = [_step(1, {"freq": {"a": 1, "b": 2}})]
-        adapter = HashMapAdapter()
-        assert adapter.can_handle(steps)
-
-    def test_generate_animations(self):
-        steps = [
-            _step(1, {"counts": {}}),
-            _step(2, {"counts": {"x": 1}}),
-            _step(3, {"counts": {"x": 2}}),
-        ]
-        adapter = HashMapAdapter()
-        adapter.can_handle(steps)  # sets tracked variable
-        cmds = adapter.generate_animations(steps)
+class TestGenerateAnimations:
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize("adapter_cls,steps_fixture", [
+        (StackAdapter, "stack_steps"),
+        (HeapAdapter, "heap_steps"),
+        (HashMapAdapter, "hashmap_steps"),
+        (GenericAdapter, "generic_steps"),
+    ])
+    def test_generate_animations(self, request, benchmark, adapter_cls, steps_fixture):
+        steps = request.getfixturevalue(steps_fixture)
+        adapter = adapter_cls()
+        assert adapter.can_handle(steps)  # also sets the tracked variable
+        cmds = benchmark(adapter.generate_animations, steps)  # resets itself, so repeat rounds are safe
         assert len(cmds) > 0
 
 
-# ── SetAdapter ───────────────────────────────────────────────────────
-
-class TestSetAdapter:
-    def test_can_handle_set_keyword(self):
-        steps = [_step(1, {"visited": set()})]
-        adapter = SetAdapter()
-        assert adapter.can_handle(steps)
+# ── can_handle ───────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("adapter_cls,variables", [
+    pytest.param(StackAdapter, {"stack": [1, 2]}, id="stack"),
+    pytest.param(QueueAdapter, {"queue": [1]}, id="queue"),
+    pytest.param(QueueAdapter, {"deque": [1, 2, 3]}, id="deque"),
+    pytest.param(LinkedListAdapter, {"linked_list": [1, 2, 3]}, id="linked_list_keywords"),
+    pytest.param(TreeAdapter, {"root": {"val": 5, "left": None, "right": None}}, id="tree"),
+    # TreeAdapter's keywords include 'heap', so it CAN handle it.
+    # In the registry, HeapAdapter has higher priority so it matches first.
+    pytest.param(TreeAdapter, {"heap": [10, 20, 30]}, id="tree_heap_like_array"),
+    pytest.param(HeapAdapter, {"heap": [3, 1, 2]}, id="heap_name"),
+    pytest.param(MatrixAdapter, {"grid": [[0, 0], [0, 0]]}, id="matrix_2d_list"),
+    pytest.param(MatrixAdapter, {"dp": [[0, 1], [2, 3]]}, id="matrix_dp"),
+    pytest.param(HashMapAdapter, {"freq": {"a": 1, "b": 2}}, id="hashmap_dict"),
+    pytest.param(SetAdapter, {"visited": set()}, id="set_keyword"),
+    pytest.param(GenericAdapter, {"x": 42}, id="generic_always"),
+])
+def test_can_handle(adapter_cls, variables):
+    # Fresh adapter per case: can_handle latches the first variable it matches
+    assert adapter_cls().can_handle([_step(1, variables)])
 
 
-# ── GenericAdapter ───────────────────────────────────────────────────
-
-class TestGenericAdapter:
-    def test_always_handles(self):
-        steps = [_step(1, {"x": 42})]
-        adapter = GenericAdapter()
-        assert adapter.can_handle(steps)
+# ── LinkedListAdapter ─────────────────────────────────────────────────
 
+class TestLinkedListAdapter:
     def test_generate_animations(self):
-        steps = [_step(1, {"a": 1}), _step(2, {"a": 2, "b": 3})]
-        adapter = GenericAdapter()
+        steps = [_step(1, {"head": None}), _step(2, {"head": {"val": 1, "next": None}})]
+        adapter = LinkedListAdapter()
         cmds = adapter.generate_animations(steps)
-        assert len(cmds) > 0
+        assert isinstance(cmds, list)
 
 
 # ── AdapterRegistry ─────────────────────────────────────────────────
@@ -190,9 +143,8 @@ class TestAdapterRegistry:
         adapter = auto_detect_adapter(steps)
         assert adapter is not None
 
-    def test_registry_list_all(self):
-        info = AdapterRegistry.get_adapter_info()
-        assert len(info) > 0
+    def test_registry_list_all(self, adapter_info):
+        assert len(adapter_info) > 0
 
 
 # ── Run with: pytest tests/test_new_adapters.py -v ───────────────────
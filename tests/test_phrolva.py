@@ -1,4 +1,3 @@
-#!/usr/bin/env python3
 """
 Test Stage 3: Phrolva Core - Animation Engine
 Validates that the React/TypeScript frontend is properly set up
@@ -6,86 +5,112 @@ Validates that the React/TypeScript frontend is properly set up
 
 import os
 import json
-import subprocess
 import sys
+from pathlib import Path
 
-def check_file_exists(filepath, description):
-    """Check if a required file exists"""
-    if os.path.exists(filepath):
-        print(f"✅ {description}: {filepath}")
-        return True
-    else:
-        print(f"❌ {description} missing: {filepath}")
-        return False
+import pytest
 
-def test_stage3_setup():
-    """Test that all Stage 3 components are in place"""
+# orjson is optional - parses bytes directly and faster; stdlib json takes bytes too
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Repo root, so the checks don't depend on where pytest was started from
+ROOT = Path(__file__).resolve().parent.parent
+
+# Build output and installed packages can hold tens of thousands of files we never check
+_SKIP_DIRS = {"node_modules", ".git", "dist"}
+
+
+def _collect_tree(root):
+    """Every file under ROOT / root as a '/'-joined path relative to ROOT, from one scandir walk"""
+    present = set()
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(ROOT / directory) as entries:
+                for entry in entries:
+                    path = f"{directory}/{entry.name}"
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _SKIP_DIRS:
+                            pending.append(path)
+                    else:
+                        present.add(path)
+        except OSError:
+            continue  # Missing or unreadable directory - its files just won't be present
+    return present
+
+
+# Backend-only checkouts don't ship the frontend - one stat says whether to bother
+_HAS_FRONTEND = (ROOT / "phrolva").is_dir()
+
+
+def _validate_stage3():
+    """Check that all Stage 3 components are in place, printing a report
+
+    Returns the missing files and the missing package.json dependencies
+    """
     
     print("\n" + "="*70)
     print("STAGE 3: PHROLVA CORE - VALIDATION TEST")
     print("="*70)
     
-    all_good = True
-    
-    # Check project structure
-    print("\n📁 Project Structure:")
-    required_files = [
-        ("phrolva/package.json", "Package configuration"),
-        ("phrolva/tsconfig.json", "TypeScript configuration"),
-        ("phrolva/vite.config.ts", "Vite build configuration"),
-        ("phrolva/index.html", "HTML template"),
-    ]
-    
-    for filepath, desc in required_files:
-        all_good &= check_file_exists(filepath, desc)
-    
-    # Check React components
-    print("\n⚛️ React Components:")
-    components = [
-        ("phrolva/src/App.tsx", "Main App component"),
-        ("phrolva/src/main.tsx", "React entry point"),
-        ("phrolva/src/components/AnimationOrchestrator.tsx", "Animation orchestrator"),
-        ("phrolva/src/components/AnimatedArray.tsx", "Array visualizer"),
-        ("phrolva/src/components/AnimatedGraph.tsx", "Graph visualizer"),
-        ("phrolva/src/components/AnimatedString.tsx", "String visualizer"),
-        ("phrolva/src/components/PlaybackControls.tsx", "Playback controls"),
-        ("phrolva/src/components/CodeDisplay.tsx", "Code display"),
+    present = _collect_tree("phrolva")
+    sections = [
+        ("📁 Project Structure:", [
+            ("phrolva/package.json", "Package configuration"),
+            ("phrolva/tsconfig.json", "TypeScript configuration"),
+            ("phrolva/vite.config.ts", "Vite build configuration"),
+            ("phrolva/index.html", "HTML template"),
+        ]),
+        ("⚛️ React Components:", [
+            ("phrolva/src/App.tsx", "Main App component"),
+            ("phrolva/src/main.tsx", "React entry point"),
+            ("phrolva/src/components/AnimationOrchestrator.tsx", "Animation orchestrator"),
+            ("phrolva/src/components/AnimatedArray.tsx", "Array visualizer"),
+            ("phrolva/src/components/AnimatedGraph.tsx", "Graph visualizer"),
+            ("phrolva/src/components/AnimatedString.tsx", "String visualizer"),
+            ("phrolva/src/components/PlaybackControls.tsx", "Playback controls"),
+            ("phrolva/src/components/CodeDisplay.tsx", "Code display"),
+        ]),
+        ("📝 TypeScript Types:", [
+            ("phrolva/src/types/animation.types.ts", "Animation types"),
+            ("phrolva/src/stores/animationStore.ts", "State management"),
+            ("phrolva/src/styles/GlobalStyles.ts", "Global styles"),
+        ]),
     ]
     
-    for filepath, desc in components:
-        all_good &= check_file_exists(filepath, desc)
-    
-    # Check TypeScript types
-    print("\n📝 TypeScript Types:")
-    types = [
-        ("phrolva/src/types/animation.types.ts", "Animation types"),
-        ("phrolva/src/stores/animationStore.ts", "State management"),
-        ("phrolva/src/styles/GlobalStyles.ts", "Global styles"),
-    ]
-    
-    for filepath, desc in types:
-        all_good &= check_file_exists(filepath, desc)
+    # One set lookup per file decides everything; the report goes out in a single write
+    missing = {path for _, items in sections for path, _ in items} - present
+    lines = []
+    for title, items in sections:
+        lines.append(f"\n{title}")
+        lines.extend(f"❌ {desc} missing: {path}" if path in missing else f"✅ {desc}: {path}"
+                     for path, desc in items)
+    sys.stdout.write("\n".join(lines) + "\n")
     
     # Check package.json has correct dependencies
     print("\n📦 Dependencies Check:")
-    if os.path.exists("phrolva/package.json"):
-        with open("phrolva/package.json", "r") as f:
-            package = json.load(f)
+    missing_deps = []
+    if "phrolva/package.json" in present:
+        # Parse straight from bytes - no text-mode decode pass first
+        package = _json_loads((ROOT / "phrolva" / "package.json").read_bytes())
+        found = package.get("dependencies", {})
             
         required_deps = ["react", "react-dom", "d3", "framer-motion", "react-spring", "styled-components"]
-        missing_deps = []
         
         for dep in required_deps:
-            if dep in package.get("dependencies", {}):
+            if dep in found:
                 print(f"  ✅ {dep}")
             else:
                 print(f"  ❌ {dep} missing")
                 missing_deps.append(dep)
-                all_good = False
     
     # Summary
     print("\n" + "="*70)
-    if all_good:
+    if not missing and not missing_deps:
         print("🎉 STAGE 3 VALIDATION PASSED!")
         print("✅ All Phrolva components are in place")
         print("\n📋 Component Summary:")
@@ -106,73 +131,99 @@ def test_stage3_setup():
     
     print("="*70)
     
-    return all_good
+    return sorted(missing), missing_deps
 
-def create_sample_visualization():
-    """Create a sample visualization.json for testing"""
-    
-    sample_data = {
-        "metadata": {
-            "timestamp": "2024-01-01T00:00:00",
-            "code_length": 100,
-            "code_lines": 10,
-            "variables": ["arr", "i", "j"],
-            "data_structures": {
-                "arrays": ["arr"],
-                "dicts": [],
-                "strings": [],
-                "numbers": []
-            }
-        },
-        "execution": {
-            "total_steps": 47,
-            "steps": [
-                {
-                    "step_number": 1,
-                    "line_number": 1,
-                    "variables": {"arr": [5, 2, 4, 1, 3]},
-                    "stdout": ""
-                }
-            ]
-        },
-        "animations": {
-            "total_commands": 15,
-            "commands": [
-                {
-                    "type": "COMPARE",
-                    "indices": [0, 1],
-                    "duration": 300,
-                    "values": {}
-                },
-                {
-                    "type": "SWAP",
-                    "indices": [0, 1],
-                    "duration": 500,
-                    "values": {}
-                }
-            ],
-            "duration_ms": 7500
-        },
-        "visualizer_config": {
-            "type": "ArrayAdapter",
-            "auto_play": False,
-            "speed": 1.0
+
+@pytest.mark.skipif(not _HAS_FRONTEND, reason="phrolva frontend not present")
+def test_stage3_setup():
+    """Test that all Stage 3 components are in place"""
+    missing, missing_deps = _validate_stage3()
+    assert not missing, f"Missing Phrolva files: {missing}"
+    assert not missing_deps, f"Missing Phrolva dependencies: {missing_deps}"
+
+
+_SAMPLE_DATA = {
+    "metadata": {
+        "timestamp": "2024-01-01T00:00:00",
+        "code_length": 100,
+        "code_lines": 10,
+        "variables": ["arr", "i", "j"],
+        "data_structures": {
+            "arrays": ["arr"],
+            "dicts": [],
+            "strings": [],
+            "numbers": []
         }
+    },
+    "execution": {
+        "total_steps": 47,
+        "steps": [
+            {
+                "step_number": 1,
+                "line_number": 1,
+                "variables": {"arr": [5, 2, 4, 1, 3]},
+                "stdout": ""
+            }
+        ]
+    },
+    "animations": {
+        "total_commands": 15,
+        "commands": [
+            {
+                "type": "COMPARE",
+                "indices": [0, 1],
+                "duration": 300,
+                "values": {}
+            },
+            {
+                "type": "SWAP",
+                "indices": [0, 1],
+                "duration": 500,
+                "values": {}
+            }
+        ],
+        "duration_ms": 7500
+    },
+    "visualizer_config": {
+        "type": "ArrayAdapter",
+        "auto_play": False,
+        "speed": 1.0
     }
-    
-    # Save to phrolva/public for dev server
-    os.makedirs("phrolva/public", exist_ok=True)
-    with open("phrolva/public/visualization.json", "w") as f:
-        json.dump(sample_data, f, indent=2)
-    
-    print("\n📄 Created sample visualization.json for testing")
+}
 
-if __name__ == "__main__":
-    passed = test_stage3_setup()
-    
-    if passed:
-        create_sample_visualization()
-        print("\n✨ Stage 3 is ready for testing!")
-        print("Run 'cd phrolva && npm install && npm run dev' to start the frontend")
-    
-    sys.exit(0 if passed else 1)
+# The sample never changes, so encode it once at import
+_SAMPLE_BYTES = json.dumps(_SAMPLE_DATA, indent=2).encode()
+
+
+def create_sample_visualization(target=None):
+    """Write a sample visualization.json (by default where the dev server serves it)
+
+    Not run by the suite against the real tree - call it by hand before `npm run dev`
+    """
+    if target is None:
+        if not _HAS_FRONTEND:
+            return None  # Nowhere to put it
+        target = ROOT / "phrolva" / "public" / "visualization.json"
+    
+    path = Path(target)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(_SAMPLE_BYTES)
+    
+    return target
+
+
+@pytest.fixture
+def sample_visualization(tmp_path):
+    # tmp_path keeps test runs from dropping files into the frontend tree
+    return create_sample_visualization(str(tmp_path / "public" / "visualization.json"))
+
+
+def test_sample_visualization(sample_visualization):
+    """The sample must have every top-level section the frontend reads"""
+    with open(sample_visualization) as f:
+        data = json.load(f)
+    assert set(data) == {"metadata", "execution", "animations", "visualizer_config"}
+    assert data["visualizer_config"]["type"] == "ArrayAdapter"
+
+
+# ── Run with: pytest tests/test_phrolva.py -v ───────────────────────